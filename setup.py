@@ -6,7 +6,7 @@ Use setup.cfg to configure the project.
 import sys
 
 from pkg_resources import VersionConflict, require
-from setuptools import setup
+from setuptools import Extension, setup
 
 try:
     require("setuptools>=38.3")
@@ -14,6 +14,23 @@ except VersionConflict:
     print("Error: version of setuptools is too old (<38.3)!")
     sys.exit(1)
 
+# The compiled calibration kernels are optional: without Cython or a compiler,
+# probnumeval falls back to its pure-Python implementation.
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    ext_modules = []
+else:
+    ext_modules = cythonize(
+        [
+            Extension(
+                "probnumeval.multivariate._quadform",
+                ["src/probnumeval/multivariate/_quadform.pyx"],
+                optional=True,
+            )
+        ]
+    )
+
 
 if __name__ == "__main__":
-    setup()
+    setup(ext_modules=ext_modules)
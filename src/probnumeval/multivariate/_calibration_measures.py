@@ -1,5 +1,6 @@
 """Uncertainty calibration measures."""
 
+import functools
 from typing import Union
 
 import numpy as np
@@ -9,6 +10,11 @@ from probnum import _randomvariablelist, randvars
 
 from probnumeval import config
 
+try:
+    from ._quadform import batched_quadform as _compiled_batched_quadform
+except ImportError:
+    _compiled_batched_quadform = None
+
 __all__ = [
     "anees",
     "non_credibility_index",
@@ -18,6 +24,15 @@ __all__ = [
 # The following pylint-exception is for the _randomvariablelist access:
 # pylint: disable=protected-access
 
+_CHUNK_SIZE_IN_BYTES = 262144
+"""Memory occupied by the covariance matrices that are processed at once."""
+
+_MAX_NUMBA_DIMENSION = 16
+"""Largest dimension for which the unblocked Numba Cholesky beats LAPACK."""
+
+_MIN_NUMBA_STEPS = 100000
+"""Shortest trajectory for which the Numba kernel makes up for its warm-up time."""
+
 
 def anees(
     approximate_solution: Union[
@@ -62,14 +77,12 @@ def anees(
         An alternative calibration measure.
 
     """
-    centered_mean = approximate_solution.mean - reference_solution
-    cov_matrices = approximate_solution.cov
-
-    centered_mean = np.atleast_2d(centered_mean)
-    cov_matrices = np.atleast_3d(cov_matrices)
+    centered_mean, cov_matrices = _compute_centered_mean_and_covariances(
+        approximate_solution, reference_solution
+    )
 
     normalized_discrepancies = _compute_normalized_discrepancies(
-        centered_mean, cov_matrices
+        centered_mean, cov_matrices, _get_covariance_inversion_params()
     )
     return np.mean(normalized_discrepancies)
 
@@ -108,30 +121,12 @@ def non_credibility_index(
             "The non-credibility index is only valid for a collection of random variables."
         )
 
-    centered_mean = approximate_solution.mean - reference_solution
-    cov_matrices = approximate_solution.cov
-
-    centered_mean = np.atleast_2d(centered_mean)
-    cov_matrices = np.atleast_3d(cov_matrices)
-
-    normalized_discrepancies = _compute_normalized_discrepancies(
-        centered_mean, cov_matrices
-    )
-
-    sample_covariance_matrix = np.tile(
-        np.cov(centered_mean.T), reps=(len(centered_mean), 1, 1)
+    centered_mean, cov_matrices = _compute_centered_mean_and_covariances(
+        approximate_solution, reference_solution
     )
 
-    reference_discrepancies = _compute_normalized_discrepancies(
-        centered_mean, sample_covariance_matrix
-    )
-    nci = 10 * (
-        np.mean(
-            np.abs(
-                np.log10(normalized_discrepancies) - np.log10(reference_discrepancies)
-            )
-        )
-    )
+    log_ratios = _compute_log_discrepancy_ratios(centered_mean, cov_matrices)
+    nci = 10 * np.mean(np.abs(log_ratios))
     return nci
 
 
@@ -171,51 +166,420 @@ def inclination_index(
             "The inclination index is only valid for a collection of random variables."
         )
 
-    cov_matrices = approximate_solution.cov
-    centered_mean = approximate_solution.mean - reference_solution
-
-    normalized_discrepancies = _compute_normalized_discrepancies(
-        centered_mean, cov_matrices
+    centered_mean, cov_matrices = _compute_centered_mean_and_covariances(
+        approximate_solution, reference_solution
     )
 
-    sample_covariance_matrix = np.tile(
-        np.cov(centered_mean.T), reps=(len(centered_mean), 1, 1)
+    log_ratios = _compute_log_discrepancy_ratios(centered_mean, cov_matrices)
+    ii = 10 * np.mean(log_ratios)
+    return ii
+
+
+def _compute_centered_mean_and_covariances(approximate_solution, reference_solution):
+    """Bring the residuals and the covariances into the shapes (N, d) and (N, d, d).
+
+    The (possibly stacked) moments are materialized as contiguous arrays of the
+    configured dtype once, so that the computations below need no further checks
+    or conversions. The residuals are formed before the cast, because subtracting
+    two nearby single-precision values would cancel most of their digits.
+    """
+    dtype = config.COVARIANCE_INVERSION["dtype"]
+    cov = np.asarray(approximate_solution.cov)
+
+    if isinstance(approximate_solution, _randomvariablelist._RandomVariableList):
+        num_steps = len(approximate_solution)
+    else:
+        num_steps = 1
+    centered_mean = np.asarray(approximate_solution.mean) - np.asarray(
+        reference_solution
     )
+    centered_mean = np.ascontiguousarray(
+        centered_mean.reshape(num_steps, -1), dtype=dtype
+    )
+    dim = centered_mean.shape[1]
+    if cov.size != num_steps * dim * dim:
+        raise ValueError(
+            "The covariances of the approximate solution do not match its means."
+        )
+    cov_matrices = np.ascontiguousarray(cov.reshape(num_steps, dim, dim), dtype=dtype)
+    return centered_mean, cov_matrices
+
 
-    reference_discrepancies = _compute_normalized_discrepancies(
-        centered_mean, sample_covariance_matrix
+def _compute_log_discrepancy_ratios(centered_mean, cov_matrices):
+    """Compute the log-ratios of the normalized discrepancies with respect to the
+    covariances of the approximate solution and with respect to the sample covariance.
+
+    Since log(a) - log(b) = log(a / b), a single division and a single logarithm,
+    both in place, suffice.
+    """
+    # Both terms are computed with the same settings.
+    params = _get_covariance_inversion_params()
+    centered_mean = np.ascontiguousarray(centered_mean)
+    discrepancies = _compute_normalized_discrepancies(
+        centered_mean, cov_matrices, params
     )
-    ii = 10 * (
-        np.mean(np.log10(normalized_discrepancies))
-        - np.mean(np.log10(reference_discrepancies))
+    reference_discrepancies = _compute_reference_discrepancies(centered_mean, params)
+    if np.any(discrepancies <= 0.0) or np.any(reference_discrepancies <= 0.0):
+        raise ValueError(
+            "The normalized discrepancies must be positive to take their logarithm."
+        )
+    np.divide(discrepancies, reference_discrepancies, out=discrepancies)
+    return np.log10(discrepancies, out=discrepancies)
+
+
+def _get_covariance_inversion_params():
+    """Look up the configuration once per call, not once per time-step."""
+    params = dict(config.COVARIANCE_INVERSION)
+    if params["strategy"] not in _NORMALIZED_DISCREPANCY_FNS:
+        raise ValueError("Covariance inversion parameters are not known.")
+    if params["dtype"] not in (np.float32, np.float64):
+        raise ValueError("Covariance inversion parameters are not known.")
+    return params
+
+
+def _compute_normalized_discrepancies(centered_mean, cov_matrices, params):
+    dtype = params["dtype"]
+    # The choice of kernel depends on the whole trajectory, not on a single chunk.
+    params = dict(params, num_steps=len(centered_mean))
+
+    centered_mean = np.ascontiguousarray(centered_mean, dtype=dtype)
+    cov_matrices = np.asarray(cov_matrices, dtype=dtype)
+
+    # Process long trajectories in chunks whose covariances fit into the L2 cache.
+    N, d = centered_mean.shape
+    chunk_size = max(1, _CHUNK_SIZE_IN_BYTES // (d * d * cov_matrices.itemsize))
+    discrepancies = np.empty(N, dtype=dtype)
+    for start in range(0, N, chunk_size):
+        chunk = slice(start, start + chunk_size)
+        discrepancies[chunk] = _compute_structured_discrepancies(
+            centered_mean[chunk], cov_matrices[chunk], params
+        )
+    return discrepancies
+
+
+def _compute_structured_discrepancies(centered_mean, cov_matrices, params):
+    structure = params["structure"]
+    if structure == "dense":
+        return _compute_dense_discrepancies(centered_mean, cov_matrices, params)
+    if structure == "block_diag":
+        return _compute_block_diagonal_discrepancies(
+            centered_mean, cov_matrices, params
+        )
+    if structure == "banded":
+        return _compute_banded_discrepancies(centered_mean, cov_matrices, params)
+    raise ValueError("Covariance inversion parameters are not known.")
+
+
+def _compute_dense_discrepancies(centered_mean, cov_matrices, params):
+    strategy = params["strategy"]
+    symmetrize = params["symmetrize"]
+    damping = params["damping"]
+    if centered_mean.shape[1] <= 2 and strategy in ("inv", "solve", "cholesky"):
+        return _compute_low_dimensional_discrepancies(
+            centered_mean, cov_matrices, strategy, symmetrize, damping
+        )
+
+    batched_quadform = _select_batched_quadform(cov_matrices, params)
+    if batched_quadform is not None:
+        discrepancies = batched_quadform(
+            centered_mean, cov_matrices, symmetrize, damping
+        )
+        if np.any(discrepancies < 0.0):
+            raise np.linalg.LinAlgError("A covariance matrix is not positive definite.")
+        return discrepancies
+
+    # Allocate at most one C-contiguous copy of the covariances and modify it in
+    # place. The Cholesky strategy overwrites the covariances with their factors.
+    if symmetrize:
+        cov_matrices = np.add(cov_matrices, cov_matrices.swapaxes(-1, -2), order="C")
+        cov_matrices *= 0.5
+    elif damping > 0.0 or strategy == "cholesky":
+        cov_matrices = np.array(cov_matrices, order="C")
+    if damping > 0.0:
+        _add_damping(cov_matrices, damping)
+
+    return _NORMALIZED_DISCREPANCY_FNS[strategy](centered_mean, cov_matrices)
+
+
+def _compute_block_diagonal_discrepancies(centered_mean, cov_matrices, params):
+    """The quadratic form of a block-diagonal matrix is the sum of the quadratic
+    forms of its blocks, each of which is inverted with the configured strategy."""
+    block_sizes = _get_structure_param(params, "block_sizes")
+    if not all(_is_integer(size) and size > 0 for size in block_sizes):
+        raise ValueError("The block sizes must be positive integers.")
+    if sum(block_sizes) != centered_mean.shape[1]:
+        raise ValueError("The block sizes do not match the dimension of the solution.")
+
+    discrepancies = np.zeros(len(centered_mean), dtype=cov_matrices.dtype)
+    start = 0
+    for block_size in block_sizes:
+        block = slice(start, start + block_size)
+        discrepancies += _compute_dense_discrepancies(
+            np.ascontiguousarray(centered_mean[:, block]),
+            cov_matrices[:, block, block],
+            params,
+        )
+        start += block_size
+    return discrepancies
+
+
+def _compute_banded_discrepancies(centered_mean, cov_matrices, params):
+    """Exploit that the covariances are symmetric positive definite and banded.
+
+    Only the lower band is read, and the configured strategy is ignored. A bandwidth
+    beyond the dimension of the solution is equivalent to a dense covariance.
+    """
+    symmetrize = params["symmetrize"]
+    damping = params["damping"]
+    d = centered_mean.shape[1]
+    bandwidth = _get_structure_param(params, "bandwidth")
+    if not _is_integer(bandwidth) or bandwidth < 0:
+        raise ValueError("The bandwidth must be a non-negative integer.")
+    bandwidth = min(bandwidth, d - 1)
+
+    bands = _to_lower_band_storage(cov_matrices, bandwidth, symmetrize, damping)
+    return _banded_cholesky_discrepancies(centered_mean, bands)
+
+
+def _banded_cholesky_discrepancies(centered_mean, bands):
+    # As for dense covariances, calling LAPACK directly avoids the input
+    # validation of scipy.linalg.solveh_banded, which dominates for small bands.
+    pbtrf, tbtrs = scipy.linalg.get_lapack_funcs(("pbtrf", "tbtrs"), (bands,))
+    discrepancies = np.empty(len(bands), dtype=bands.dtype)
+    for n, (m, band) in enumerate(zip(centered_mean, bands)):
+        cholesky_factor, info = pbtrf(band.T, lower=1, overwrite_ab=1)
+        if info > 0:
+            raise np.linalg.LinAlgError(
+                f"{info}-th leading minor of the covariance is not positive definite."
+            )
+        whitened_mean, _ = tbtrs(cholesky_factor, m, uplo="L")
+        discrepancies[n] = whitened_mean @ whitened_mean
+    return discrepancies
+
+
+def _to_lower_band_storage(cov_matrices, bandwidth, symmetrize, damping):
+    """Copy the lower band into the storage bands[n, j, k] = C_n[j + k, j].
+
+    The transpose of bands[n] is Fortran-contiguous, which LAPACK can factorize
+    in place.
+    """
+    N, d, _ = cov_matrices.shape
+    bands = np.zeros((N, d, bandwidth + 1), dtype=cov_matrices.dtype)
+    for k in range(bandwidth + 1):
+        lower_diagonal = np.diagonal(cov_matrices, offset=-k, axis1=1, axis2=2)
+        if symmetrize:
+            upper_diagonal = np.diagonal(cov_matrices, offset=k, axis1=1, axis2=2)
+            lower_diagonal = 0.5 * (lower_diagonal + upper_diagonal)
+        bands[:, : d - k, k] = lower_diagonal
+    bands[:, :, 0] += damping
+    return bands
+
+
+def _get_structure_param(params, key):
+    structure_params = params["structure_params"]
+    if structure_params is None or key not in structure_params:
+        raise ValueError(
+            f"The structure '{params['structure']}' requires the parameter '{key}'."
+        )
+    return structure_params[key]
+
+
+def _is_integer(value):
+    return isinstance(value, (int, np.integer)) and not isinstance(value, bool)
+
+
+def _select_batched_quadform(cov_matrices, params):
+    """Select a compiled kernel for the Cholesky strategy, if one is available.
+
+    The extension module is compiled at install time and has no warm-up cost,
+    but it only supports double precision. The Numba kernel decomposes each
+    covariance without blocking, which only pays off for small dimensions.
+    Importing Numba and loading (or compiling) the kernel takes a noticeable time,
+    so it is only used for long trajectories.
+    """
+    if params["strategy"] != "cholesky":
+        return None
+    if _compiled_batched_quadform is not None and cov_matrices.dtype == np.float64:
+        return _compiled_batched_quadform
+    if (
+        cov_matrices.shape[-1] <= _MAX_NUMBA_DIMENSION
+        and params["num_steps"] >= _MIN_NUMBA_STEPS
+    ):
+        return _load_numba_batched_quadform()
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _load_numba_batched_quadform():
+    try:
+        # pylint: disable=import-outside-toplevel
+        from ._numba_quadform import batched_quadform
+    except ImportError:
+        return None
+    return batched_quadform
+
+
+def _pinv_discrepancies(centered_mean, cov_matrices):
+    return np.einsum(
+        "ni,nij,nj->n", centered_mean, np.linalg.pinv(cov_matrices), centered_mean
     )
-    return ii
 
 
-def _compute_normalized_discrepancies(centered_mean, cov_matrices):
-    return np.array(
-        [
-            _compute_normalized_discrepancy(m, C)
-            for (m, C) in zip(centered_mean, cov_matrices)
-        ]
+def _solve_discrepancies(centered_mean, cov_matrices):
+    solutions = np.linalg.solve(cov_matrices, centered_mean[..., None])[..., 0]
+    return np.einsum("ni,ni->n", centered_mean, solutions)
+
+
+def _cholesky_discrepancies(centered_mean, cov_matrices):
+    # LAPACK does not act on stacks of matrices,
+    # so the Cholesky strategy loops over the time-steps.
+    # The transpose of a C-contiguous matrix is Fortran-contiguous,
+    # which LAPACK can factorize in place without copying it first.
+    potrf, trtrs = scipy.linalg.get_lapack_funcs(("potrf", "trtrs"), (cov_matrices,))
+    discrepancies = np.empty(len(cov_matrices), dtype=cov_matrices.dtype)
+    for i, (m, C) in enumerate(zip(centered_mean, cov_matrices)):
+        discrepancies[i] = _compute_normalized_discrepancy(m, C.T, potrf, trtrs)
+    return discrepancies
+
+
+_NORMALIZED_DISCREPANCY_FNS = {
+    # Explicitly forming the inverse is slower and less accurate than solving.
+    "inv": _solve_discrepancies,
+    "pinv": _pinv_discrepancies,
+    "solve": _solve_discrepancies,
+    "cholesky": _cholesky_discrepancies,
+}
+
+
+def _add_damping(matrices, damping):
+    """Add the damping to the diagonal of a (stack of) matrices in place.
+
+    The diagonal is accessed through a writable view, which requires neither an
+    identity matrix nor index arrays.
+    """
+    diagonals = np.einsum("...ii->...i", matrices)
+    diagonals += damping
+
+
+def _compute_low_dimensional_discrepancies(
+    centered_mean, cov_matrices, strategy, symmetrize, damping
+):
+    """Evaluate the quadratic forms in closed form for one- and two-dimensional states.
+
+    This avoids calling LAPACK altogether, which is pure overhead for such small
+    matrices. As in LAPACK, the Cholesky strategy only reads the lower triangle.
+    """
+    if centered_mean.shape[1] == 1:
+        variances = cov_matrices[:, 0, 0] + damping
+        _check_low_dimensional_inverse(variances, variances, strategy)
+        return centered_mean[:, 0] ** 2 / variances
+
+    upper_left = cov_matrices[:, 0, 0] + damping
+    lower_right = cov_matrices[:, 1, 1] + damping
+    lower, upper = cov_matrices[:, 1, 0], cov_matrices[:, 0, 1]
+    if symmetrize:
+        lower = upper = 0.5 * (lower + upper)
+    first, second = centered_mean[:, 0], centered_mean[:, 1]
+
+    if strategy == "cholesky":
+        return _compute_two_dimensional_cholesky_discrepancies(
+            first, second, upper_left, lower, lower_right
+        )
+
+    # The determinant squares the scale of the covariances, which underflows in
+    # single precision, so the closed-form inverse is evaluated in double precision.
+    upper_left, lower_right, lower, upper, first, second = (
+        np.asarray(value, dtype=np.float64)
+        for value in (upper_left, lower_right, lower, upper, first, second)
     )
+    determinants = upper_left * lower_right - upper * lower
+    _check_low_dimensional_inverse(upper_left, determinants, strategy)
+    discrepancies = (
+        lower_right * first ** 2
+        - (upper + lower) * first * second
+        + upper_left * second ** 2
+    ) / determinants
+    return discrepancies.astype(cov_matrices.dtype, copy=False)
+
+
+def _compute_two_dimensional_cholesky_discrepancies(
+    first, second, upper_left, lower, lower_right
+):
+    """Whiten the residuals with the closed-form Cholesky factor.
 
+    C = L L^T with L = [[l11, 0], [l21, sqrt(s)]]. Unlike the determinant, the
+    factor never squares the scale of the covariances.
+    """
+    _check_low_dimensional_inverse(upper_left, upper_left, "cholesky")
+    l11 = np.sqrt(upper_left)
+    l21 = lower / l11
+    schur_complement = lower_right - l21 ** 2
+    _check_low_dimensional_inverse(upper_left, schur_complement, "cholesky")
+    whitened_first = first / l11
+    whitened_second = (second - l21 * whitened_first) / np.sqrt(schur_complement)
+    return whitened_first ** 2 + whitened_second ** 2
 
-def _compute_normalized_discrepancy(mean, cov):
 
-    if config.COVARIANCE_INVERSION["symmetrize"]:
-        cov = 0.5 * (cov + cov.T)
-    if config.COVARIANCE_INVERSION["damping"] > 0.0:
-        cov += config.COVARIANCE_INVERSION["damping"] * np.eye(len(cov))
+def _check_low_dimensional_inverse(upper_left, determinants, strategy):
+    if strategy == "cholesky":
+        if np.any(upper_left <= 0.0) or np.any(determinants <= 0.0):
+            raise np.linalg.LinAlgError("A covariance matrix is not positive definite.")
+    elif np.any(determinants == 0.0):
+        raise np.linalg.LinAlgError("Singular matrix")
 
-    if config.COVARIANCE_INVERSION["strategy"] == "inv":
-        return mean @ np.linalg.inv(cov) @ mean
-    if config.COVARIANCE_INVERSION["strategy"] == "pinv":
-        return mean @ np.linalg.pinv(cov) @ mean
-    if config.COVARIANCE_INVERSION["strategy"] == "solve":
-        return mean @ np.linalg.solve(cov, mean)
-    if config.COVARIANCE_INVERSION["strategy"] == "cholesky":
-        L, lower = scipy.linalg.cho_factor(cov, lower=True)
-        return mean @ scipy.linalg.cho_solve((L, lower), mean)
 
-    raise ValueError("Covariance inversion parameters are not known.")
+def _compute_reference_discrepancies(centered_mean, params):
+    """Normalize the discrepancies with the sample covariance matrix.
+
+    The sample covariance is the same for all time-steps, so it is inverted once
+    and applied to all discrepancies at the same time.
+    """
+    damping = params["damping"]
+    strategy = params["strategy"]
+
+    # Equivalent to np.cov(centered_mean.T), but goes straight to a single matmul.
+    residuals = centered_mean - centered_mean.mean(axis=0)
+    sample_covariance_matrix = residuals.T @ residuals
+    sample_covariance_matrix /= len(residuals) - 1
+    if damping > 0.0:
+        _add_damping(sample_covariance_matrix, damping)
+
+    if strategy == "pinv":
+        solutions = centered_mean @ np.linalg.pinv(sample_covariance_matrix).T
+        return np.einsum("ni,ni->n", centered_mean, solutions)
+    if strategy == "cholesky":
+        # A single factorization of the sample covariance whitens all residuals.
+        potrf, trtrs = scipy.linalg.get_lapack_funcs(
+            ("potrf", "trtrs"), (sample_covariance_matrix,)
+        )
+        whitened_mean = _whiten_with_cholesky(
+            centered_mean.T, sample_covariance_matrix.T, potrf, trtrs
+        )
+        return np.einsum("in,in->n", whitened_mean, whitened_mean)
+    solutions = np.linalg.solve(sample_covariance_matrix, centered_mean.T).T
+    return np.einsum("ni,ni->n", centered_mean, solutions)
+
+
+def _compute_normalized_discrepancy(mean, cov_transposed, potrf, trtrs):
+    # The quadratic form m^T C^{-1} m equals ||L^{-1} m||^2 with C = L L^T.
+    whitened_mean = _whiten_with_cholesky(mean, cov_transposed, potrf, trtrs)
+    return whitened_mean @ whitened_mean
+
+
+def _whiten_with_cholesky(rhs, cov_transposed, potrf, trtrs):
+    """Compute L^{-1} b for a right-hand side b (vector or columns of a matrix).
+
+    Calling LAPACK directly skips the input validation of
+    scipy.linalg.cho_factor/cho_solve, which dominates for small matrices.
+    potrf and trtrs are the single- or double-precision LAPACK routines.
+    The upper triangle of the transposed covariance is the lower triangle of
+    the covariance. It is overwritten with U = L^T, so only a single triangular
+    solve with U^T = L is required.
+    """
+    cholesky_factor, info = potrf(cov_transposed, lower=0, clean=0, overwrite_a=1)
+    if info > 0:
+        raise np.linalg.LinAlgError(
+            f"{info}-th leading minor of the covariance is not positive definite."
+        )
+    whitened_rhs, _ = trtrs(cholesky_factor, rhs, lower=0, trans=1)
+    return whitened_rhs
@@ -0,0 +1,79 @@
+"""Just-in-time compiled normalized discrepancies for the Cholesky strategy.
+
+Importing this module requires Numba. For small dimensions, a hand-written Cholesky
+decomposition beats calling LAPACK once per time-step.
+"""
+
+import numba
+import numpy as np
+
+__all__ = ["batched_quadform"]
+
+
+@numba.njit(parallel=True, fastmath=True, cache=True)
+def batched_quadform(means, covs, symmetrize, damping):
+    """Compute m^T C^{-1} m for each time-step.
+
+    Only the lower triangle of each covariance is read. Time-steps whose covariance
+    is not positive definite are marked with -1.
+    """
+    N, d = means.shape
+    out = np.empty(N, dtype=covs.dtype)
+    for n in numba.prange(N):  # pylint: disable=not-an-iterable
+        L = np.empty((d, d), dtype=covs.dtype)
+        _copy_lower_triangle(covs[n], symmetrize, damping, L)
+        if _cholesky_in_place(L):
+            out[n] = _whitened_squared_norm(L, means[n])
+        else:
+            out[n] = -1.0
+    return out
+
+
+@numba.njit(fastmath=True, cache=True)
+def _copy_lower_triangle(cov, symmetrize, damping, L):
+    """Symmetrize, damp and copy the lower triangle in a single pass."""
+    d = cov.shape[0]
+    for i in range(d):
+        for j in range(i):
+            if symmetrize:
+                L[i, j] = 0.5 * (cov[i, j] + cov[j, i])
+            else:
+                L[i, j] = cov[i, j]
+        L[i, i] = cov[i, i] + damping
+
+
+@numba.njit(fastmath=True, cache=True)
+def _cholesky_in_place(L):
+    """Overwrite the lower triangle of L with its Cholesky factor.
+
+    Returns False if the matrix is not positive definite.
+    """
+    d = L.shape[0]
+    for j in range(d):
+        pivot = L[j, j]
+        for k in range(j):
+            pivot -= L[j, k] * L[j, k]
+        if pivot <= 0.0:
+            return False
+        L[j, j] = np.sqrt(pivot)
+        for i in range(j + 1, d):
+            s = L[i, j]
+            for k in range(j):
+                s -= L[i, k] * L[j, k]
+            L[i, j] = s / L[j, j]
+    return True
+
+
+@numba.njit(fastmath=True, cache=True)
+def _whitened_squared_norm(L, mean):
+    """m^T C^{-1} m = ||y||^2 with L y = m (one forward substitution)."""
+    d = mean.shape[0]
+    y = np.empty(d, dtype=L.dtype)
+    quadform = 0.0
+    for i in range(d):
+        s = mean[i]
+        for k in range(i):
+            s -= L[i, k] * y[k]
+        y[i] = s / L[i, i]
+        quadform += y[i] * y[i]
+    return quadform
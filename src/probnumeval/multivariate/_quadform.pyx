@@ -0,0 +1,67 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""Compiled normalized discrepancies for the Cholesky strategy.
+
+Unlike the Numba kernel, this module is compiled at install time and therefore has no
+warm-up cost on the first call.
+"""
+
+import numpy as np
+
+from scipy.linalg.cython_lapack cimport dpotrf, dtrtrs
+
+
+def batched_quadform(
+    const double[:, :] means,
+    const double[:, :, :] covs,
+    bint symmetrize,
+    double damping,
+):
+    """Compute m^T C^{-1} m for each time-step.
+
+    Only the lower triangle of each covariance is read, and the inputs are never
+    written to, so read-only arrays are accepted. Time-steps whose covariance is not
+    positive definite are marked with -1.
+    """
+    cdef Py_ssize_t N = means.shape[0]
+    cdef Py_ssize_t d = means.shape[1]
+    cdef Py_ssize_t n, i, j
+    cdef int dim = <int>d
+    cdef int nrhs = 1
+    cdef int info
+    cdef char lower = b"L"
+    cdef char notrans = b"N"
+    cdef char nonunit = b"N"
+    cdef double quadform
+
+    cdef double[::1, :] work = np.empty((d, d), order="F")
+    cdef double[::1] y = np.empty(d)
+    cdef double[::1] out = np.empty(N)
+
+    with nogil:
+        for n in range(N):
+            # Symmetrize, damp and copy the lower triangle in a single pass.
+            for j in range(d):
+                for i in range(j, d):
+                    if symmetrize:
+                        work[i, j] = 0.5 * (covs[n, i, j] + covs[n, j, i])
+                    else:
+                        work[i, j] = covs[n, i, j]
+                work[j, j] += damping
+                y[j] = means[n, j]
+
+            dpotrf(&lower, &dim, &work[0, 0], &dim, &info)
+            if info != 0:
+                out[n] = -1.0
+                continue
+
+            # m^T C^{-1} m = ||y||^2 with L y = m (one triangular solve).
+            dtrtrs(
+                &lower, &notrans, &nonunit, &dim, &nrhs,
+                &work[0, 0], &dim, &y[0], &dim, &info
+            )
+            quadform = 0.0
+            for i in range(d):
+                quadform = quadform + y[i] * y[i]
+            out[n] = quadform
+
+    return np.asarray(out)
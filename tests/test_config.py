@@ -1,12 +1,22 @@
 """Tests for configurations."""
 
+import numpy as np
+import pytest
+
 from probnumeval import config
 
 
 def test_cov_inversion():
     """Assert that the keys have not changed."""
     cov_keys = config.COVARIANCE_INVERSION.keys()
-    assert list(cov_keys) == ["strategy", "symmetrize", "damping"]
+    assert list(cov_keys) == [
+        "strategy",
+        "symmetrize",
+        "damping",
+        "dtype",
+        "structure",
+        "structure_params",
+    ]
 
 
 def test_cov_inversion_defaults():
@@ -14,6 +24,9 @@ def test_cov_inversion_defaults():
     assert config.COVARIANCE_INVERSION["strategy"] == "cholesky"
     assert config.COVARIANCE_INVERSION["symmetrize"]
     assert config.COVARIANCE_INVERSION["damping"] == 0.0
+    assert config.COVARIANCE_INVERSION["dtype"] == np.float64
+    assert config.COVARIANCE_INVERSION["structure"] == "dense"
+    assert config.COVARIANCE_INVERSION["structure_params"] is None
 
 
 def test_setter():
@@ -22,13 +35,15 @@ def test_setter():
     assert config.COVARIANCE_INVERSION["symmetrize"]
     assert config.COVARIANCE_INVERSION["damping"] == 0.0
 
-    config.set_covariance_inversion_parameters(
-        strategy="inv", symmetrize=False, damping=10.0
-    )
+    with pytest.warns(DeprecationWarning):
+        config.set_covariance_inversion_parameters(
+            strategy="inv", symmetrize=False, damping=10.0, dtype=np.float32
+        )
 
     assert config.COVARIANCE_INVERSION["strategy"] == "inv"
     assert not config.COVARIANCE_INVERSION["symmetrize"]
     assert config.COVARIANCE_INVERSION["damping"] == 10.0
+    assert config.COVARIANCE_INVERSION["dtype"] == np.float32
 
     # Set back to previous values in order not to mess up the tests below.
     config.set_covariance_inversion_parameters(
@@ -42,13 +57,53 @@ def test_context():
     assert config.COVARIANCE_INVERSION["symmetrize"]
     assert config.COVARIANCE_INVERSION["damping"] == 0.0
 
-    with config.covariance_inversion_context(
-        strategy="pinv", symmetrize=False, damping=10.0
+    with pytest.warns(DeprecationWarning), config.covariance_inversion_context(
+        strategy="pinv",
+        symmetrize=False,
+        damping=10.0,
+        dtype=np.float32,
+        structure="banded",
+        structure_params=dict(bandwidth=1),
     ):
         assert config.COVARIANCE_INVERSION["strategy"] == "pinv"
         assert not config.COVARIANCE_INVERSION["symmetrize"]
         assert config.COVARIANCE_INVERSION["damping"] == 10.0
+        assert config.COVARIANCE_INVERSION["dtype"] == np.float32
+        assert config.COVARIANCE_INVERSION["structure"] == "banded"
+        assert config.COVARIANCE_INVERSION["structure_params"] == dict(bandwidth=1)
 
     assert config.COVARIANCE_INVERSION["strategy"] == "cholesky"
     assert config.COVARIANCE_INVERSION["symmetrize"]
     assert config.COVARIANCE_INVERSION["damping"] == 0.0
+    assert config.COVARIANCE_INVERSION["dtype"] == np.float64
+    assert config.COVARIANCE_INVERSION["structure"] == "dense"
+
+
+@pytest.mark.parametrize("strategy", ["inv", "pinv"])
+def test_deprecated_strategies(strategy):
+    """Inverting covariance matrices explicitly is deprecated."""
+    with pytest.warns(DeprecationWarning):
+        config.set_covariance_inversion_parameters(
+            strategy=strategy, symmetrize=True, damping=0.0
+        )
+
+    # Set back to previous values in order not to mess up the tests below.
+    config.set_covariance_inversion_parameters(
+        strategy="cholesky", symmetrize=True, damping=0.0
+    )
+
+
+def test_deprecation_points_at_caller():
+    """The deprecation warnings point at the code that requests the strategy."""
+    with pytest.warns(DeprecationWarning) as record:
+        config.set_covariance_inversion_parameters(
+            strategy="inv", symmetrize=True, damping=0.0
+        )
+        config.set_covariance_inversion_parameters(
+            strategy="cholesky", symmetrize=True, damping=0.0
+        )
+        with config.covariance_inversion_context(strategy="pinv"):
+            pass
+
+    assert len(record) == 2
+    assert all(warning.filename == __file__ for warning in record)
@@ -4,12 +4,22 @@ import pytest
 from probnum import _randomvariablelist, randvars
 
 from probnumeval import config, multivariate
+from probnumeval.multivariate import _calibration_measures
 
+# The strategies "inv" and "pinv" are deprecated, but still supported.
+deprecated = pytest.mark.filterwarnings("ignore::DeprecationWarning")
 all_strategies = pytest.mark.parametrize(
-    "strategy", ["inv", "pinv", "solve", "cholesky"]
+    "strategy",
+    [
+        pytest.param("inv", marks=deprecated),
+        pytest.param("pinv", marks=deprecated),
+        "solve",
+        "cholesky",
+    ],
 )
 all_symmetries = pytest.mark.parametrize("symmetrize", [True, False])
 all_dampings = pytest.mark.parametrize("damping", [1.0, 0.0])
+all_dimensions = pytest.mark.parametrize("dim", [1, 2, 3])
 
 
 # The following pylint-exception is for the _randomvariablelist access:
@@ -37,6 +47,22 @@ def reference_solution():
     return np.random.rand(10, 2)
 
 
+@pytest.fixture(params=[1, 2, 3])
+def spd_trajectory(request):
+    """Means, symmetric positive definite covariances, and a reference solution."""
+    dim = request.param
+    rng = np.random.default_rng(seed=1)
+    factors = rng.random((15, dim, dim))
+    cov_matrices = factors @ factors.swapaxes(-1, -2) + np.eye(dim)
+    return rng.random((15, dim)), cov_matrices, rng.random((15, dim))
+
+
+def _as_rvlist(means, cov_matrices):
+    return _randomvariablelist._RandomVariableList(
+        [randvars.Normal(mean=m, cov=C) for (m, C) in zip(means, cov_matrices)]
+    )
+
+
 @all_strategies
 @all_symmetries
 @all_dampings
@@ -80,3 +106,298 @@ def test_inclination_index(
             approximate_solution, reference_solution
         )
     assert np.isscalar(output)
+
+
+@all_strategies
+@all_symmetries
+@all_dampings
+def test_anees_matches_loop(spd_trajectory, strategy, symmetrize, damping):
+    """The batched covariance inversion coincides with a loop over time-steps."""
+    means, cov_matrices, reference = spd_trajectory
+    dim = means.shape[1]
+    # Symmetrization removes any skew-symmetric perturbation of the covariances
+    skew = np.random.rand(*cov_matrices.shape) * symmetrize
+    rvlist = _as_rvlist(means, cov_matrices + skew - np.swapaxes(skew, -1, -2))
+
+    with config.covariance_inversion_context(
+        strategy=strategy, symmetrize=symmetrize, damping=damping
+    ):
+        output = multivariate.anees(rvlist, reference)
+
+    expected = np.mean(
+        [
+            (m - r) @ np.linalg.solve(C + damping * np.eye(dim), m - r)
+            for (m, C, r) in zip(means, cov_matrices, reference)
+        ]
+    )
+    np.testing.assert_allclose(output, expected)
+
+
+@all_dimensions
+def test_cholesky_not_positive_definite(dim):
+    """The Cholesky strategy complains about indefinite covariances."""
+    rvlist = _randomvariablelist._RandomVariableList(
+        [randvars.Normal(mean=np.ones(dim), cov=-np.eye(dim)) for _ in range(5)]
+    )
+    with config.covariance_inversion_context(strategy="cholesky"):
+        with pytest.raises(np.linalg.LinAlgError):
+            multivariate.anees(rvlist, np.zeros((5, dim)))
+
+
+@all_strategies
+def test_inclination_index_matches_loop(spd_trajectory, strategy):
+    """The sample covariance is inverted once, but the result is unchanged."""
+    means, cov_matrices, reference = spd_trajectory
+    rvlist = _as_rvlist(means, cov_matrices)
+
+    with config.covariance_inversion_context(strategy=strategy):
+        output = multivariate.inclination_index(rvlist, reference)
+
+    centered_mean = means - reference
+    sample_cov = np.atleast_2d(np.cov(centered_mean.T))
+    normalized = [
+        m @ np.linalg.solve(C, m) for (m, C) in zip(centered_mean, cov_matrices)
+    ]
+    sampled = [m @ np.linalg.solve(sample_cov, m) for m in centered_mean]
+    expected = 10 * (np.mean(np.log10(normalized)) - np.mean(np.log10(sampled)))
+    np.testing.assert_allclose(output, expected)
+
+
+def test_unknown_strategy(approximate_solution, reference_solution):
+    with config.covariance_inversion_context(strategy="unknown"):
+        with pytest.raises(ValueError):
+            multivariate.anees(approximate_solution, reference_solution)
+
+
+@pytest.mark.parametrize(
+    "calibration_measure",
+    [multivariate.non_credibility_index, multivariate.inclination_index],
+)
+def test_vanishing_discrepancy(approximate_solution, calibration_measure):
+    """A residual of zero has no logarithm."""
+    reference_solution = np.random.rand(10, 2)
+    reference_solution[0] = approximate_solution.mean[0]
+    with pytest.raises(ValueError):
+        calibration_measure(approximate_solution, reference_solution)
+
+
+@all_strategies
+def test_anees_single_precision(spd_trajectory, strategy):
+    """Single precision is sufficiently accurate for calibration statistics."""
+    means, cov_matrices, reference = spd_trajectory
+    rvlist = _as_rvlist(means, cov_matrices)
+
+    with config.covariance_inversion_context(strategy=strategy, dtype=np.float64):
+        expected = multivariate.anees(rvlist, reference)
+    with config.covariance_inversion_context(strategy=strategy, dtype=np.float32):
+        output = multivariate.anees(rvlist, reference)
+
+    np.testing.assert_allclose(output, expected, rtol=1e-4)
+
+
+@all_strategies
+def test_anees_single_precision_tiny_covariances(spd_trajectory, strategy):
+    """Covariances far below the single-precision scale of one do not underflow."""
+    means, cov_matrices, reference = spd_trajectory
+    rvlist = _as_rvlist(1e-12 * means, 1e-24 * cov_matrices)
+
+    with config.covariance_inversion_context(strategy=strategy, dtype=np.float64):
+        expected = multivariate.anees(rvlist, 1e-12 * reference)
+    with config.covariance_inversion_context(strategy=strategy, dtype=np.float32):
+        output = multivariate.anees(rvlist, 1e-12 * reference)
+
+    np.testing.assert_allclose(output, expected, rtol=1e-4)
+
+
+@all_strategies
+def test_non_credibility_index_single_precision(spd_trajectory, strategy):
+    """Residuals that are small relative to the solution keep their digits."""
+    means, cov_matrices, reference = spd_trajectory
+    reference = 100.0 + reference
+    rvlist = _as_rvlist(reference + 1e-5 * means, 1e-10 * cov_matrices)
+
+    with config.covariance_inversion_context(strategy=strategy, dtype=np.float64):
+        expected = multivariate.non_credibility_index(rvlist, reference)
+    with config.covariance_inversion_context(strategy=strategy, dtype=np.float32):
+        output = multivariate.non_credibility_index(rvlist, reference)
+
+    np.testing.assert_allclose(output, expected, rtol=1e-3)
+
+
+@pytest.mark.parametrize("symmetrize", [True, False])
+@pytest.mark.parametrize(
+    "kernel_module",
+    ["probnumeval.multivariate._quadform", "probnumeval.multivariate._numba_quadform"],
+)
+def test_batched_quadform(kernel_module, symmetrize):
+    """The compiled kernels, if they are available, evaluate the quadratic forms."""
+    kernel = pytest.importorskip(kernel_module)
+    rng = np.random.default_rng(seed=4)
+    factors = rng.random((15, 4, 4))
+    cov_matrices = factors @ factors.swapaxes(-1, -2) + np.eye(4)
+    means = rng.random((15, 4))
+    # Covariances of random variables are often read-only views
+    means.flags.writeable = False
+    cov_matrices.flags.writeable = False
+
+    output = kernel.batched_quadform(means, cov_matrices, symmetrize, 0.5)
+
+    damped = cov_matrices + 0.5 * np.eye(4)
+    expected = np.einsum(
+        "ni,ni->n", means, np.linalg.solve(damped, means[..., None])[..., 0]
+    )
+    np.testing.assert_allclose(output, expected)
+
+
+def test_anees_numba_kernel(spd_trajectory, monkeypatch):
+    """Long trajectories use the Numba kernel, which does not change the result."""
+    pytest.importorskip("probnumeval.multivariate._numba_quadform")
+    means, cov_matrices, reference = spd_trajectory
+    rvlist = _as_rvlist(means, cov_matrices)
+
+    with config.covariance_inversion_context(strategy="solve"):
+        expected = multivariate.anees(rvlist, reference)
+    monkeypatch.setattr(_calibration_measures, "_MIN_NUMBA_STEPS", 1)
+    with config.covariance_inversion_context(strategy="cholesky", dtype=np.float32):
+        output = multivariate.anees(rvlist, reference)
+    np.testing.assert_allclose(output, expected, rtol=1e-4)
+
+
+@pytest.fixture
+def structured_problem():
+    """Tridiagonal, block-diagonal covariances (blocks of size 1, 2, and 3)."""
+    rng = np.random.default_rng(seed=5)
+    cov_matrices = np.zeros((15, 6, 6))
+    for start, stop in [(0, 1), (1, 3), (3, 6)]:
+        size = stop - start
+        off_diagonal = rng.random((15, size - 1))
+        cov_matrices[:, start:stop, start:stop] = 2.0 * np.eye(size)
+        for n in range(15):
+            cov_matrices[n, start:stop, start:stop] += np.diag(off_diagonal[n], 1)
+            cov_matrices[n, start:stop, start:stop] += np.diag(off_diagonal[n], -1)
+    means = rng.random((15, 6))
+    return _as_rvlist(means, cov_matrices), rng.random((15, 6))
+
+
+@all_strategies
+@all_dampings
+@pytest.mark.parametrize(
+    "structure, structure_params",
+    [("banded", dict(bandwidth=1)), ("block_diag", dict(block_sizes=[1, 2, 3]))],
+)
+def test_anees_structured(
+    structured_problem, strategy, damping, structure, structure_params
+):
+    """Exploiting the structure of the covariances does not change the result."""
+    rvlist, reference = structured_problem
+    with config.covariance_inversion_context(strategy=strategy, damping=damping):
+        expected = multivariate.anees(rvlist, reference)
+    with config.covariance_inversion_context(
+        strategy=strategy,
+        damping=damping,
+        structure=structure,
+        structure_params=structure_params,
+    ):
+        output = multivariate.anees(rvlist, reference)
+    np.testing.assert_allclose(output, expected)
+
+
+def test_block_sizes_mismatch(structured_problem):
+    rvlist, reference = structured_problem
+    with config.covariance_inversion_context(
+        strategy="cholesky",
+        structure="block_diag",
+        structure_params=dict(block_sizes=[2, 2]),
+    ):
+        with pytest.raises(ValueError):
+            multivariate.anees(rvlist, reference)
+
+
+def test_bandwidth_exceeds_dimension(structured_problem):
+    """A bandwidth beyond the dimension amounts to dense covariances."""
+    rvlist, reference = structured_problem
+    expected = multivariate.anees(rvlist, reference)
+    with config.covariance_inversion_context(
+        strategy="cholesky", structure="banded", structure_params=dict(bandwidth=10)
+    ):
+        output = multivariate.anees(rvlist, reference)
+    np.testing.assert_allclose(output, expected)
+
+
+@pytest.mark.parametrize("bandwidth", [0, 1])
+def test_banded_not_positive_definite(bandwidth):
+    rvlist = _randomvariablelist._RandomVariableList(
+        [randvars.Normal(mean=np.ones(4), cov=-np.eye(4)) for _ in range(5)]
+    )
+    with config.covariance_inversion_context(
+        strategy="cholesky",
+        structure="banded",
+        structure_params=dict(bandwidth=bandwidth),
+    ):
+        with pytest.raises(np.linalg.LinAlgError):
+            multivariate.anees(rvlist, np.zeros((5, 4)))
+
+
+@pytest.mark.parametrize(
+    "structure, structure_params",
+    [("banded", None), ("block_diag", None), ("block_diag", dict(bandwidth=1))],
+)
+def test_missing_structure_params(structured_problem, structure, structure_params):
+    rvlist, reference = structured_problem
+    with config.covariance_inversion_context(
+        strategy="cholesky", structure=structure, structure_params=structure_params
+    ):
+        with pytest.raises(ValueError):
+            multivariate.anees(rvlist, reference)
+
+
+@pytest.mark.parametrize(
+    "structure, structure_params",
+    [
+        ("block_diag", dict(block_sizes=[-1, 7])),
+        ("block_diag", dict(block_sizes=[0, 6])),
+        ("block_diag", dict(block_sizes=[3.0, 3.0])),
+        ("banded", dict(bandwidth=-1)),
+        ("banded", dict(bandwidth=1.0)),
+    ],
+)
+def test_invalid_structure_params(structured_problem, structure, structure_params):
+    rvlist, reference = structured_problem
+    with config.covariance_inversion_context(
+        strategy="cholesky", structure=structure, structure_params=structure_params
+    ):
+        with pytest.raises(ValueError):
+            multivariate.anees(rvlist, reference)
+
+
+@all_strategies
+def test_anees_chunked(spd_trajectory, strategy, monkeypatch):
+    """Processing the time-steps in chunks does not change the result."""
+    means, cov_matrices, reference = spd_trajectory
+    dim = means.shape[1]
+    rvlist = _as_rvlist(means, cov_matrices)
+
+    with config.covariance_inversion_context(strategy=strategy):
+        expected = multivariate.anees(rvlist, reference)
+        # Four time-steps per chunk
+        monkeypatch.setattr(
+            _calibration_measures, "_CHUNK_SIZE_IN_BYTES", 4 * dim * dim * 8
+        )
+        output = multivariate.anees(rvlist, reference)
+    np.testing.assert_allclose(output, expected)
+
+
+def test_anees_single_normal():
+    """A single random variable is a trajectory with a single time-step."""
+    rv = randvars.Normal(mean=np.arange(1.0, 4.0), cov=np.diag(np.arange(1.0, 4.0)))
+    output = multivariate.anees(rv, np.zeros(3))
+    np.testing.assert_allclose(output, 6.0)
+
+
+def test_anees_scalar_normals():
+    """A list of scalar random variables is a one-dimensional trajectory."""
+    rvlist = _randomvariablelist._RandomVariableList(
+        [randvars.Normal(mean=2.0, cov=4.0) for _ in range(10)]
+    )
+    output = multivariate.anees(rvlist, np.zeros(10))
+    np.testing.assert_allclose(output, 1.0)
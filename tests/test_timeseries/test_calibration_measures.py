@@ -5,8 +5,16 @@ from probnum import filtsmooth, randvars, statespace
 
 from probnumeval import config, timeseries
 
+# The strategies "inv" and "pinv" are deprecated, but still supported.
+deprecated = pytest.mark.filterwarnings("ignore::DeprecationWarning")
 all_strategies = pytest.mark.parametrize(
-    "strategy", ["inv", "pinv", "solve", "cholesky"]
+    "strategy",
+    [
+        pytest.param("inv", marks=deprecated),
+        pytest.param("pinv", marks=deprecated),
+        "solve",
+        "cholesky",
+    ],
 )
 all_symmetries = pytest.mark.parametrize("symmetrize", [True, False])
 all_dampings = pytest.mark.parametrize("damping", [1.0, 0.0])